@@ -116,7 +116,8 @@ class OK:
                                           trigger_tasks=self.config.get('trigger_tasks', []),
                                           scenes=self.config['scenes'],
                                           feature_set=self.feature_set,
-                                          config_folder=self.config.get("config_folder"), debug=self.debug)
+                                          config_folder=self.config.get("config_folder"), debug=self.debug,
+                                          max_fps=self.config.get("max_fps", 30))
 
         ok.gui.executor = self.task_executor
 
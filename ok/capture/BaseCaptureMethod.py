@@ -1,3 +1,5 @@
+import threading
+
 import numpy as np
 
 from ok.logging.Logger import get_logger
@@ -13,6 +15,8 @@ class BaseCaptureMethod:
     name = "None"
     description = ""
     _size = (0, 0)
+    # capture methods that receive frames from a callback set this event when a new frame arrives
+    frame_ready: threading.Event | None = None
 
     def __init__(self):
         # Some capture methods don't need an initialization process
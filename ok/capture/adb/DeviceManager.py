@@ -8,7 +8,7 @@ from adbutils import AdbError
 from ok.alas.platform_windows import get_emulator_exe
 from ok.capture.HwndWindow import HwndWindow, find_hwnd
 from ok.capture.adb.ADBCaptureMethod import ADBCaptureMethod
-from ok.capture.adb.WindowsCaptureFactory import update_capture_method
+from ok.capture.adb.WindowsCaptureFactory import update_capture_method, clear_bit_blt_probe_cache
 from ok.config.Config import Config
 from ok.gui.Communicate import communicate
 from ok.interaction.ADBInteraction import ADBBaseInteraction
@@ -49,6 +49,7 @@ class DeviceManager:
 
     def refresh(self):
         logger.debug('calling refresh')
+        clear_bit_blt_probe_cache()
         self.handler.post(self.do_refresh, remove_existing=True, skip_if_running=True)
 
     @property
@@ -1,30 +1,60 @@
+import time
+
+import win32con
+import win32gui
+
 from ok.logging.Logger import get_logger
 
 logger = get_logger(__name__)
 
+# this module is imported by DeviceManager at startup, a broken capture backend must not stop the app
+try:
+    from ok.capture.windows.BitBltCaptureMethod import BitBltCaptureMethod
+except Exception as e:
+    logger.error('import BitBltCaptureMethod failed, BitBlt capture is disabled', e)
+    BitBltCaptureMethod = None
+try:
+    from ok.capture.windows.WindowsGraphicsCaptureMethod import WindowsGraphicsCaptureMethod, \
+        windows_graphics_available
+except Exception as e:
+    logger.error('import WindowsGraphicsCaptureMethod failed, WGC capture is disabled', e)
+    WindowsGraphicsCaptureMethod = None
+    windows_graphics_available = None
+
+# the os build doesn't change at runtime, check it on first use only
+_windows_graphics_available = None
+
+# (hwnd, window style) -> time of the last failed BitBlt probe, probing grabs and scans a full frame.
+# Only failures are cached and only briefly, they are often temporary (minimized or loading window),
+# a success is always probed again so a window that stops rendering for BitBlt is noticed.
+_bitblt_probe_failures: dict[tuple[int, int], float] = {}
+BIT_BLT_PROBE_FAILURE_EXPIRE = 3
+
 
 def update_capture_method(config, capture_method, hwnd, require_bg=False, use_bit_blt_only=False):
     try:
-        if config.get('can_bit_blt'):
-            logger.debug(
-                f"try BitBlt method {config} {hwnd} current_type:{type(capture_method)}")
-            from ok.capture.windows.BitBltCaptureMethod import BitBltCaptureMethod
-            target_method = BitBltCaptureMethod
-            capture_method = get_capture(capture_method, target_method, hwnd)
-            if capture_method.test_is_not_pure_color():
-                return capture_method
+        if BitBltCaptureMethod is not None and config.get('can_bit_blt'):
+            probe_key = bit_blt_probe_key(hwnd)
+            if bit_blt_probe_failed_recently(probe_key):
+                logger.debug(f"BitBlt probe failed recently for {hwnd}, skip BitBlt")
             else:
-                logger.info("test_is_not_pure_color failed, can't use BitBlt")
+                logger.debug(
+                    f"try BitBlt method {config} {hwnd} current_type:{type(capture_method)}")
+                target_method = BitBltCaptureMethod
+                capture_method = get_capture(capture_method, target_method, hwnd)
+                if probe_bit_blt(capture_method, probe_key):
+                    return capture_method
+                else:
+                    logger.info("test_is_not_pure_color failed, can't use BitBlt")
         if use_bit_blt_only:
             return None
-        from ok.capture.windows.WindowsGraphicsCaptureMethod import windows_graphics_available
-        if windows_graphics_available():
-            from ok.capture.windows.WindowsGraphicsCaptureMethod import WindowsGraphicsCaptureMethod
+        if is_windows_graphics_available():
             target_method = WindowsGraphicsCaptureMethod
             capture_method = get_capture(capture_method, target_method, hwnd)
             return capture_method
 
         if not require_bg:
+            # only needed when BitBlt and WGC both fail, and d3dshot is an optional dependency
             from ok.capture.windows.DesktopDuplicationCaptureMethod import DesktopDuplicationCaptureMethod
             target_method = DesktopDuplicationCaptureMethod
             capture_method = get_capture(capture_method, target_method, hwnd)
@@ -33,6 +63,52 @@ def update_capture_method(config, capture_method, hwnd, require_bg=False, use_bi
         logger.error(f'update_capture_method exception, return None: ', e)
 
 
+def is_windows_graphics_available():
+    global _windows_graphics_available
+    if _windows_graphics_available is None:
+        _windows_graphics_available = WindowsGraphicsCaptureMethod is not None and bool(
+            windows_graphics_available())
+    return _windows_graphics_available
+
+
+def bit_blt_probe_key(hwnd):
+    if hwnd is None or not hwnd.hwnd:
+        return None
+    try:
+        return hwnd.hwnd, win32gui.GetWindowLong(hwnd.hwnd, win32con.GWL_STYLE)
+    except Exception as e:
+        logger.error(f'bit_blt_probe_key GetWindowLong failed {hwnd}', e)
+        return None
+
+
+def bit_blt_probe_failed_recently(probe_key):
+    if probe_key is None:
+        return False
+    failed_time = _bitblt_probe_failures.get(probe_key)
+    return failed_time is not None and time.monotonic() - failed_time <= BIT_BLT_PROBE_FAILURE_EXPIRE
+
+
+def probe_bit_blt(capture_method, probe_key):
+    result = capture_method.test_is_not_pure_color()
+    now = time.monotonic()
+    for key, failed_time in list(_bitblt_probe_failures.items()):
+        if now - failed_time > BIT_BLT_PROBE_FAILURE_EXPIRE:
+            del _bitblt_probe_failures[key]
+    if probe_key is not None:
+        if result:
+            _bitblt_probe_failures.pop(probe_key, None)
+        else:
+            _bitblt_probe_failures[probe_key] = now
+    return result
+
+
+def clear_bit_blt_probe_cache():
+    """
+    Called on an explicit refresh, so BitBlt is always probed again.
+    """
+    _bitblt_probe_failures.clear()
+
+
 def get_capture(capture_method, target_method, hwnd):
     if not isinstance(capture_method, target_method):
         if capture_method is not None:
@@ -1,30 +1,104 @@
 import ctypes
+import ctypes.wintypes
+import threading
 
 import numpy as np
-import pywintypes
 import win32con
-import win32gui
-import win32ui
 from cv2.typing import MatLike
 from typing_extensions import override
 
 from ok.capture.windows.BaseWindowsCaptureMethod import BaseWindowsCaptureMethod
-from ok.capture.windows.utils import try_delete_dc, BGRA_CHANNEL_COUNT
+from ok.capture.windows.utils import BGRA_CHANNEL_COUNT, BGR_CHANNEL_COUNT
 from ok.color.Color import is_close_to_pure_color
 from ok.logging.Logger import get_logger
 
 # This is an undocumented nFlag value for PrintWindow
 PW_RENDERFULLCONTENT = 0x00000002
+BI_RGB = 0
+DIB_RGB_COLORS = 0
 
 logger = get_logger(__name__)
 
 
+class BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [
+        ('biSize', ctypes.wintypes.DWORD),
+        ('biWidth', ctypes.wintypes.LONG),
+        ('biHeight', ctypes.wintypes.LONG),
+        ('biPlanes', ctypes.wintypes.WORD),
+        ('biBitCount', ctypes.wintypes.WORD),
+        ('biCompression', ctypes.wintypes.DWORD),
+        ('biSizeImage', ctypes.wintypes.DWORD),
+        ('biXPelsPerMeter', ctypes.wintypes.LONG),
+        ('biYPelsPerMeter', ctypes.wintypes.LONG),
+        ('biClrUsed', ctypes.wintypes.DWORD),
+        ('biClrImportant', ctypes.wintypes.DWORD)
+    ]
+
+
+class BITMAPINFO(ctypes.Structure):
+    _fields_ = [
+        ('bmiHeader', BITMAPINFOHEADER),
+        ('bmiColors', ctypes.wintypes.DWORD * 3)
+    ]
+
+
+# private instances so the argtypes below don't leak into ctypes.windll.
+# The whole capture path calls GDI directly through ctypes with raw handles,
+# skipping the win32ui MFC wrappers and their per call object creation.
+_user32 = ctypes.WinDLL('user32', use_last_error=True)
+_user32.GetWindowDC.restype = ctypes.wintypes.HDC
+_user32.GetWindowDC.argtypes = [ctypes.wintypes.HWND]
+_user32.ReleaseDC.restype = ctypes.c_int
+_user32.ReleaseDC.argtypes = [ctypes.wintypes.HWND, ctypes.wintypes.HDC]
+_user32.PrintWindow.restype = ctypes.wintypes.BOOL
+_user32.PrintWindow.argtypes = [ctypes.wintypes.HWND, ctypes.wintypes.HDC, ctypes.wintypes.UINT]
+
+_gdi32 = ctypes.WinDLL('gdi32', use_last_error=True)
+_gdi32.CreateCompatibleDC.restype = ctypes.wintypes.HDC
+_gdi32.CreateCompatibleDC.argtypes = [ctypes.wintypes.HDC]
+_gdi32.CreateDIBSection.restype = ctypes.wintypes.HBITMAP
+_gdi32.CreateDIBSection.argtypes = [ctypes.wintypes.HDC, ctypes.POINTER(BITMAPINFO), ctypes.wintypes.UINT,
+                                    ctypes.POINTER(ctypes.c_void_p), ctypes.wintypes.HANDLE, ctypes.wintypes.DWORD]
+_gdi32.SelectObject.restype = ctypes.wintypes.HGDIOBJ
+_gdi32.SelectObject.argtypes = [ctypes.wintypes.HDC, ctypes.wintypes.HGDIOBJ]
+_gdi32.BitBlt.restype = ctypes.wintypes.BOOL
+_gdi32.BitBlt.argtypes = [ctypes.wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                          ctypes.wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.wintypes.DWORD]
+_gdi32.GdiFlush.restype = ctypes.wintypes.BOOL
+_gdi32.GdiFlush.argtypes = []
+_gdi32.DeleteDC.restype = ctypes.wintypes.BOOL
+_gdi32.DeleteDC.argtypes = [ctypes.wintypes.HDC]
+_gdi32.DeleteObject.restype = ctypes.wintypes.BOOL
+_gdi32.DeleteObject.argtypes = [ctypes.wintypes.HGDIOBJ]
+
+
+def top_down_bitmap_info(width, height):
+    """
+    A 32-bit BGRA BITMAPINFO with a negative height.
+    Windows bitmaps are bottom-up by default, a negative height makes the DIB top-down,
+    so the rows are already in numpy/OpenCV order and the frame never needs to be flipped.
+    """
+    bitmap_info = BITMAPINFO()
+    bitmap_info.bmiHeader.biSize = ctypes.sizeof(BITMAPINFOHEADER)
+    bitmap_info.bmiHeader.biWidth = width
+    bitmap_info.bmiHeader.biHeight = -height
+    bitmap_info.bmiHeader.biPlanes = 1
+    bitmap_info.bmiHeader.biBitCount = BGRA_CHANNEL_COUNT * 8
+    bitmap_info.bmiHeader.biCompression = BI_RGB
+    return bitmap_info
+
+
 def is_blank(image: MatLike):
     """
     BitBlt can return a balnk buffer. Either because the target is unsupported,
     or because there's two windows of the same name for the same executable.
+    A blank buffer is all zeros, so a few sampled pixels rule out the common non-blank frame
+    before falling back to a full scan.
     """
-    return not image.any()
+    height, width = image.shape[:2]
+    return (not image[0, 0].any() and not image[height // 2, width // 2].any() and not image[-1, -1].any()
+            and not image[::64, ::64].any() and not image.any())
 
 
 class BitBltCaptureMethod(BaseWindowsCaptureMethod):
@@ -38,20 +112,38 @@ class BitBltCaptureMethod(BaseWindowsCaptureMethod):
 
     _render_full_content = False
 
+    def __init__(self, hwnd_window):
+        super().__init__(hwnd_window)
+        self._lock = threading.Lock()
+        self._window_dc = None
+        self._compatible_dc = None
+        self._bitmap = None
+        self._old_bitmap = None
+        self._frame_view = None
+        self._cached_hwnd = None
+        self._cached_size = None
+
+    @override
+    def close(self):
+        with self._lock:
+            self._release_dc()
+
     @override
     def do_get_frame(self) -> MatLike | None:
-        if self.hwnd_window.real_x_offset != 0 or self.hwnd_window.real_y_offset != 0:
-            x = self.hwnd_window.real_x_offset
-            y = self.hwnd_window.real_y_offset
+        hwnd_window = self.hwnd_window
+        if hwnd_window.real_x_offset != 0 or hwnd_window.real_y_offset != 0:
+            x = hwnd_window.real_x_offset
+            y = hwnd_window.real_y_offset
         else:
-            x = self.hwnd_window.border
-            y = self.hwnd_window.title_height
+            x = hwnd_window.border
+            y = hwnd_window.title_height
 
-        return bit_blt_capture_frame(self.hwnd_window.hwnd, x,
-                                     y,
-                                     self.hwnd_window.real_width or self.hwnd_window.width,
-                                     self.hwnd_window.real_height or self.hwnd_window.height,
-                                     self.hwnd_window.ext_left_bounds, self.hwnd_window.ext_top_bounds)
+        return self.bit_blt_capture_frame(hwnd_window.hwnd, x,
+                                          y,
+                                          hwnd_window.real_width or hwnd_window.width,
+                                          hwnd_window.real_height or hwnd_window.height,
+                                          hwnd_window.ext_left_bounds, hwnd_window.ext_top_bounds,
+                                          self._render_full_content)
 
     def test_exclusive_full_screen(self):
         frame = self.do_get_frame()
@@ -72,58 +164,97 @@ class BitBltCaptureMethod(BaseWindowsCaptureMethod):
             else:
                 return True
 
+    def bit_blt_capture_frame(self, hwnd, border, title_height, width, height, ext_left_bounds, ext_top_bounds,
+                              _render_full_content=False, drop_alpha=True):
+        """
+        Captures the window region into the cached DIB section.
+
+        With drop_alpha the unused alpha channel is skipped while copying out of the DIB section,
+        the returned BGR image is contiguous and 3/4 of the size of the BGRA one.
+        """
+        image: MatLike | None = None
 
-def bit_blt_capture_frame(hwnd, border, title_height, width, height, ext_left_bounds, ext_top_bounds,
-                          _render_full_content=False):
-    image: MatLike | None = None
+        if hwnd is None:
+            return image
 
-    if hwnd is None:
+        x, y, width, height = (border + ext_left_bounds,
+                               title_height + ext_top_bounds, width, height)
+
+        if width <= 0 or height <= 0:
+            return None
+        with self._lock:
+            # If the window closes while it's being manipulated, it could cause a crash
+            try:
+                self._ensure_dc(hwnd, width, height)
+
+                # Causes a 10-15x performance drop. But allows recording hardware accelerated windows
+                if _render_full_content:
+                    _user32.PrintWindow(hwnd, self._window_dc, PW_RENDERFULLCONTENT)
+
+                # On Windows there is a shadow around the windows that we need to account for.
+                # left_bounds, top_bounds = 3, 0
+                if not _gdi32.BitBlt(self._compatible_dc, 0, 0, width, height, self._window_dc, x, y,
+                                     win32con.SRCCOPY):
+                    raise ctypes.WinError(ctypes.get_last_error())
+                # make sure GDI has finished writing to the DIB section before reading it
+                _gdi32.GdiFlush()
+            except OSError:
+                # Invalid handle or the window was closed while it was being manipulated,
+                # drop the cached DCs so they are rebuilt on the next frame
+                self._release_dc()
+                return None
+
+            if not is_blank(self._frame_view):
+                # the DIB section is overwritten by the next BitBlt, the executor and the screenshot
+                # workers keep the frame around, so hand out a copy
+                if drop_alpha:
+                    # frame_view[..., :3] is a strided view, only the copy materializes it
+                    image = np.ascontiguousarray(self._frame_view[..., :BGR_CHANNEL_COUNT])
+                else:
+                    image = self._frame_view.copy()
         return image
 
-    x, y, width, height = (border + ext_left_bounds,
-                           title_height + ext_top_bounds, width, height)
-
-    if width <= 0 or height <= 0:
-        return None
-    # If the window closes while it's being manipulated, it could cause a crash
-    try:
-        window_dc = win32gui.GetWindowDC(hwnd)
-        dc_object = win32ui.CreateDCFromHandle(window_dc)
-
-        # Causes a 10-15x performance drop. But allows recording hardware accelerated windows
-        if _render_full_content:
-            ctypes.windll.user32.PrintWindow(hwnd, dc_object.GetSafeHdc(), PW_RENDERFULLCONTENT)
-
-        # On Windows there is a shadow around the windows that we need to account for.
-        # left_bounds, top_bounds = 3, 0
-        compatible_dc = dc_object.CreateCompatibleDC()
-        bitmap = win32ui.CreateBitmap()
-        bitmap.CreateCompatibleBitmap(dc_object, width, height)
-        compatible_dc.SelectObject(bitmap)
-        compatible_dc.BitBlt(
-            (0, 0),
-            (width, height),
-            dc_object,
-            (x, y),
-            win32con.SRCCOPY,
-        )
-        image = np.frombuffer(bitmap.GetBitmapBits(True), dtype=np.uint8)
-    except (win32ui.error, pywintypes.error):
-        # Invalid handle or the window was closed while it was being manipulated
-        return None
-
-    if is_blank(image):
-        image = None
-    else:
-        image.shape = (height, width, BGRA_CHANNEL_COUNT)
-
-    # Cleanup DC and handle
-    try_delete_dc(dc_object)
-    try_delete_dc(compatible_dc)
-    win32gui.ReleaseDC(hwnd, window_dc)
-    win32gui.DeleteObject(bitmap.GetHandle())
-    return image
-
-
-if __name__ == '__main__':
-    print(bit_blt_capture_frame("MuMu模拟器12", None))
+    def _ensure_dc(self, hwnd, width, height):
+        """
+        Creates the DCs and the DIB section once and reuses them across frames,
+        they are only recreated when the hwnd or the capture size changes.
+        BitBlt writes the pixels straight into the DIB section memory, which is viewed by self._frame_view.
+        """
+        if self._cached_hwnd == hwnd and self._cached_size == (width, height):
+            return
+        self._release_dc()
+        self._window_dc = _user32.GetWindowDC(hwnd)
+        if not self._window_dc:
+            raise ctypes.WinError(ctypes.get_last_error())
+        self._cached_hwnd = hwnd
+        self._compatible_dc = _gdi32.CreateCompatibleDC(self._window_dc)
+        if not self._compatible_dc:
+            raise ctypes.WinError(ctypes.get_last_error())
+        bitmap_info = top_down_bitmap_info(width, height)
+        bits = ctypes.c_void_p()
+        self._bitmap = _gdi32.CreateDIBSection(self._compatible_dc, ctypes.byref(bitmap_info),
+                                               DIB_RGB_COLORS, ctypes.byref(bits), None, 0)
+        if not self._bitmap or not bits.value:
+            raise ctypes.WinError(ctypes.get_last_error())
+        self._old_bitmap = _gdi32.SelectObject(self._compatible_dc, self._bitmap)
+        buffer = (ctypes.c_ubyte * (height * width * BGRA_CHANNEL_COUNT)).from_address(bits.value)
+        self._frame_view = np.ctypeslib.as_array(buffer).reshape(height, width, BGRA_CHANNEL_COUNT)
+        self._cached_size = (width, height)
+
+    def _release_dc(self):
+        # Cleanup DC and handle, failures are ignored as the window may already be gone
+        if self._compatible_dc:
+            if self._old_bitmap:
+                _gdi32.SelectObject(self._compatible_dc, self._old_bitmap)
+            _gdi32.DeleteDC(self._compatible_dc)
+        if self._window_dc:
+            _user32.ReleaseDC(self._cached_hwnd, self._window_dc)
+        if self._bitmap:
+            _gdi32.DeleteObject(self._bitmap)
+        self._window_dc = None
+        self._compatible_dc = None
+        self._bitmap = None
+        self._old_bitmap = None
+        self._frame_view = None
+        self._cached_hwnd = None
+        self._cached_size = None
@@ -3,6 +3,7 @@ import ctypes
 import ctypes.wintypes
 import platform
 import sys
+import threading
 import time
 
 import numpy as np
@@ -28,6 +29,7 @@ class WindowsGraphicsCaptureMethod(BaseWindowsCaptureMethod):
         super().__init__(hwnd_window)
         self.last_frame = None
         self.last_frame_time = 0
+        self.frame_ready = threading.Event()
         self.frame_pool = None
         self.item = None
         self.session = None
@@ -42,6 +44,7 @@ class WindowsGraphicsCaptureMethod(BaseWindowsCaptureMethod):
             next_frame = self.frame_pool.TryGetNextFrame()
             if next_frame is not None:
                 self.last_frame = self.convert_dx_frame(next_frame)
+                self.frame_ready.set()
             else:
                 logger.warning('frame_arrived_callback TryGetNextFrame returned None')
         except Exception as e:
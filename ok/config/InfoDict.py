@@ -1,16 +1,47 @@
+import threading
+import time
+
 from ok.gui.Communicate import communicate
 
+EMIT_INTERVAL = 0.016
+
 
 class InfoDict(dict):
+    """
+    Emits communicate.task_info at most every 16ms, a write inside the interval schedules
+    one trailing emit instead, so the last writes of a burst are always shown.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_emit = 0
+        self._trailing_emit = None
 
     def __delitem__(self, key):
         super().__delitem__(key)
-        communicate.task_info.emit()
+        self.changed()
 
     def clear(self):
         super().clear()
-        communicate.task_info.emit()
+        self.changed()
 
     def __setitem__(self, key, value):
         super().__setitem__(key, value)
+        self.changed()
+
+    def changed(self):
+        elapsed = time.monotonic() - self._last_emit
+        if elapsed > EMIT_INTERVAL:
+            self.emit()
+        elif self._trailing_emit is None:
+            self._trailing_emit = threading.Timer(EMIT_INTERVAL - elapsed, self.emit_trailing)
+            self._trailing_emit.daemon = True
+            self._trailing_emit.start()
+
+    def emit_trailing(self):
+        self._trailing_emit = None
+        self.emit()
+
+    def emit(self):
+        self._last_emit = time.monotonic()
         communicate.task_info.emit()
@@ -1,3 +1,5 @@
+from PySide6.QtCore import QTimer, QCoreApplication
+
 from ok.gui.tasks.LabelAndWidget import LabelAndWidget
 
 
@@ -11,6 +13,32 @@ class ConfigLabelAndWidget(LabelAndWidget):
         if task.config_description is not None:
             desc = task.config_description.get(key)
         super().__init__(key, desc)
+        self._pending_value = None
+        self._update_config_timer = None
 
     def update_config(self, value):
         self.config[self.key] = value
+
+    def update_config_later(self, value, delay=100):
+        """
+        Debounce the config update, every config write saves the file,
+        so holding a spin box or typing only writes the last value.
+        The pending value is also written by flush_config on editingFinished, reset and app quit.
+        """
+        self._pending_value = value
+        if self._update_config_timer is None:
+            self._update_config_timer = QTimer(self)
+            self._update_config_timer.setSingleShot(True)
+            self._update_config_timer.timeout.connect(self.flush_config)
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(self.flush_config)
+        self._update_config_timer.start(delay)
+
+    def flush_config(self):
+        if self._update_config_timer is not None and self._update_config_timer.isActive():
+            self._update_config_timer.stop()
+        if self._pending_value is not None:
+            value = self._pending_value
+            self._pending_value = None
+            self.update_config(value)
@@ -11,10 +11,11 @@ class LabelAndDoubleSpinBox(ConfigLabelAndWidget):
         self.spin_box = DoubleSpinBox()
         self.update_value()
         self.spin_box.valueChanged.connect(self.value_changed)
+        self.spin_box.editingFinished.connect(self.flush_config)
         self.add_widget(self.spin_box)
 
     def update_value(self):
         self.spin_box.setValue(self.config.get(self.key))
 
     def value_changed(self, value):
-        self.update_config(value)
+        self.update_config_later(value)
@@ -11,10 +11,11 @@ class LabelAndLineEdit(ConfigLabelAndWidget):
         self.line_edit = LineEdit()
         self.update_value()
         self.line_edit.textChanged.connect(self.value_changed)
+        self.line_edit.editingFinished.connect(self.flush_config)
         self.add_widget(self.line_edit)
 
     def update_value(self):
         self.line_edit.setText(self.config.get(self.key))
 
     def value_changed(self, value):
-        self.update_config(value)
+        self.update_config_later(value)
@@ -12,10 +12,11 @@ class LabelAndSpinBox(ConfigLabelAndWidget):
         self.spin_box.setFixedWidth(130)
         self.update_value()
         self.spin_box.valueChanged.connect(self.value_changed)
+        self.spin_box.editingFinished.connect(self.flush_config)
         self.add_widget(self.spin_box)
 
     def update_value(self):
         self.spin_box.setValue(self.config.get(self.key))
 
     def value_changed(self, value):
-        self.update_config(value)
+        self.update_config_later(value)
@@ -71,6 +71,9 @@ class TaskCard(ExpandSettingCard):
             widget.update_value()
 
     def reset_clicked(self):
+        # write pending debounced edits first, so they can't overwrite the reset values later
+        for widget in self.config_widgets:
+            widget.flush_config()
         self.task.config.reset_to_default()
         self.__updateConfig()
 
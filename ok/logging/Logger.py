@@ -108,8 +108,9 @@ class Logger:
 
 def exception_to_str(exception):
     if exception is not None:
-        traceback.print_exc()
-        stack_trace_str = traceback.format_exc()
+        # format once, the console handler already prints the logged message
+        stack_trace_str = ''.join(
+            traceback.format_exception(type(exception), exception, exception.__traceback__))
     else:
         stack_trace_str = ""
     return stack_trace_str
@@ -1,22 +1,26 @@
 import time
+from collections import deque
 
 import numpy as np
 
 
 class StreamStats:
-    last_frame_time = 0
-    sleep_padding = 0
 
     def __init__(self, max_size=100):
+        self.last_frame_time = 0
+        self.sleep_padding = 0
         self.max_size = max_size
-        self.data = []
+        self.data = deque(maxlen=max_size)
+        self._sum = 0
 
     def add_frame(self):
         now = time.time()
         if self.last_frame_time != 0:
             if len(self.data) >= self.max_size:
-                self.data.pop(0)
-            self.data.append(int((now - self.last_frame_time - self.sleep_padding) * 1000))
+                self._sum -= self.data.popleft()
+            frame_time = int((now - self.last_frame_time - self.sleep_padding) * 1000)
+            self.data.append(frame_time)
+            self._sum += frame_time
         self.last_frame_time = now
         self.sleep_padding = 0
 
@@ -25,7 +29,7 @@ class StreamStats:
 
     def mean(self):
         """Calculate and return the mean of the numbers in the stream."""
-        return round(np.mean(self.data)) if self.data else 0
+        return round(self._sum / len(self.data)) if self.data else 0
 
     def percentile(self, percentile):
         """Calculate and return the specified percentile of the numbers in the stream."""
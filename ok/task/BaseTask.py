@@ -12,15 +12,22 @@ logger = get_logger(__name__)
 
 
 class BaseTask(ExecutorOperation):
+    # the base attributes are read on every frame, keep them in slots,
+    # subclasses without __slots__ still get a __dict__ for their own attributes
+    __slots__ = ('logger', 'name', 'description', '_feature_set', '_enabled', '_config', 'info', 'default_config',
+                 'config_description', 'config_type', '_paused', 'lock', '_handler', 'running',
+                 'check_trigger_interval', 'last_check_trigger_time', 'executor', 'last_click_time')
 
     def __init__(self):
         super().__init__()
+        self.executor = None
+        self.last_click_time = 0
         self.logger = get_logger(self.__class__.__name__)
         self.name = self.__class__.__name__
         self.description = ""
-        self.feature_set = None
+        self._feature_set = None
         self._enabled = False
-        self.config = None
+        self._config = None
         self.info = InfoDict()
         self.default_config = {}
         self.config_description = {}
@@ -55,8 +62,37 @@ class BaseTask(ExecutorOperation):
         if not self._enabled:
             self._enabled = True
             self.info_clear()
+            self._notify_state_change()
         communicate.task.emit(self)
 
+    def _notify_state_change(self):
+        if self.executor is not None:
+            self.executor._on_task_state_change(self)
+
+    @property
+    def feature_set(self):
+        if self._feature_set is not None:
+            return self._feature_set
+        if self.executor is not None:
+            return self.executor.feature_set
+
+    @feature_set.setter
+    def feature_set(self, feature_set):
+        self._feature_set = feature_set
+
+    @property
+    def config(self) -> Config:
+        """
+        The config is loaded on first access, tasks that are never shown or run don't read their config file.
+        """
+        if self._config is None:
+            self.load_config()
+        return self._config
+
+    @config.setter
+    def config(self, config):
+        self._config = config
+
     @property
     def handler(self) -> Handler:
         with self.lock:
@@ -85,7 +121,6 @@ class BaseTask(ExecutorOperation):
         self.info_set("Log", message)
         if notify:
             self.notification(message)
-        communicate.task_info.emit()
 
     def log_debug(self, message, notify=False):
         self.logger.debug(message)
@@ -102,7 +137,6 @@ class BaseTask(ExecutorOperation):
         self.info_set("Error", message)
         if notify:
             self.notification(message)
-        communicate.task_info.emit()
 
     def notification(self, message, title=None, error=False):
         communicate.notification.emit(message, title, error, False)
@@ -150,7 +184,9 @@ class BaseTask(ExecutorOperation):
         pass
 
     def disable(self):
-        self._enabled = False
+        if self._enabled:
+            self._enabled = False
+            self._notify_state_change()
         communicate.task.emit(self)
 
     def run(self):
@@ -167,6 +203,4 @@ class BaseTask(ExecutorOperation):
 
     def set_executor(self, executor):
         self.executor = executor
-        self.feature_set = executor.feature_set
-        self.load_config()
         self.on_create()
@@ -7,6 +7,7 @@ from ok.gui.Communicate import communicate
 
 
 class ExecutorOperation:
+    __slots__ = ()
     executor = None
     last_click_time = 0
 
@@ -1,5 +1,6 @@
 import threading
 import time
+import zlib
 from typing import Tuple
 
 from ok.capture.BaseCaptureMethod import CaptureException
@@ -31,22 +32,30 @@ class WaitFailedException(Exception):
 
 
 class TaskExecutor:
-    current_scene: Scene | None = None
-    last_scene: Scene | None = None
-    frame_stats = StreamStats()
-    _frame = None
-    paused = True
-    ocr = None
-    pause_start = time.time()
-    pause_end_time = time.time()
-    _last_frame_time = 0
+    current_scene: Scene | None
+    last_scene: Scene | None
+    frame_stats: StreamStats
 
     def __init__(self, device_manager: DeviceManager,
                  wait_until_timeout=10, wait_until_before_delay=1, wait_until_check_delay=0,
                  exit_event=None, trigger_tasks=[], onetime_tasks=[], scenes=[], feature_set=None,
                  ocr=None,
-                 config_folder=None, debug=False):
+                 config_folder=None, debug=False, max_fps=30):
         self.device_manager = device_manager
+        self.current_scene = None
+        self.last_scene = None
+        self.frame_stats = StreamStats()
+        self._frame = None
+        self.paused = True
+        self.pause_start = time.monotonic()
+        self.pause_end_time = time.monotonic()
+        self._last_frame_time = 0
+        self._last_stats_emit = 0
+        self._trailing_stats_emit = None
+        self._last_cycle_time = 0
+        # (generation, cache_key, result) as one tuple, so a read never sees a key with another frame's result
+        self._scene_cache = None
+        self._scene_cache_generation = 0
         self.feature_set = feature_set
         self.wait_until_check_delay = wait_until_check_delay
         self.wait_until_before_delay = wait_until_before_delay
@@ -61,6 +70,11 @@ class TaskExecutor:
         self.scenes = scenes
         self.config_folder = config_folder or "config"
         self.trigger_task_index = -1
+        # capturing faster than the tasks need only wastes cpu/gpu, 0 means no limit
+        self.target_frame_interval = 1 / max_fps if max_fps > 0 else 0
+        self._tasks_lock = threading.Lock()
+        self._active_onetime_tasks = []
+        self._active_trigger_tasks = []
         for scene in self.scenes:
             scene.executor = self
             scene.feature_set = self.feature_set
@@ -68,6 +82,7 @@ class TaskExecutor:
             task.set_executor(self)
         for task in self.onetime_tasks:
             task.set_executor(self)
+        self._update_active_tasks()
         self.thread = threading.Thread(target=self.execute, name="TaskExecutor")
         self.thread.start()
 
@@ -125,6 +140,9 @@ class TaskExecutor:
         self.reset_scene()
         while not self.exit_event.is_set():
             if self.can_capture():
+                frame_ready = self.method.frame_ready
+                if frame_ready is not None:
+                    frame_ready.clear()
                 self._frame = self.method.get_frame()
                 if self._frame is not None:
                     self._last_frame_time = time.time()
@@ -133,6 +151,11 @@ class TaskExecutor:
                         logger.warning(f"captured wrong size frame: {width}x{height}")
                         self._frame = None
                     return self._frame
+                if frame_ready is not None:
+                    # the capture method pushes frames, block until the next one arrives instead of polling
+                    frame_ready.wait(0.1)
+                    self.sleep(0)
+                    continue
             self.sleep(0.001)
         raise FinishedException()
 
@@ -144,8 +167,8 @@ class TaskExecutor:
 
     @property
     def frame(self):
-        while self.paused:
-            time.sleep(1)
+        while self.paused and not self.exit_event.is_set():
+            self.exit_event.wait(1)
         if self.exit_event.is_set():
             logger.info("Exit event set. Exiting early.")
             raise FinishedException("Exit event set. Exiting early.")
@@ -156,7 +179,8 @@ class TaskExecutor:
 
     def sleep(self, timeout):
         """
-        Sleeps for the specified timeout, checking for an exit event every 100ms, with adjustments to prevent oversleeping.
+        Sleeps for the specified timeout, waiting on the exit event so it returns as soon as the exit event is set.
+        The wait is split into chunks of at most 50ms to keep checking if the current task is disabled or paused.
 
         :param timeout: The total time to sleep in seconds.
         """
@@ -165,7 +189,7 @@ class TaskExecutor:
             return
         self.reset_scene()
         self.frame_stats.add_sleep(timeout)
-        self.pause_end_time = time.time() + timeout
+        self.pause_end_time = time.monotonic() + timeout
         while True:
             if self.exit_event.is_set():
                 logger.info("Exit event set. Exiting early.")
@@ -174,11 +198,12 @@ class TaskExecutor:
                 raise TaskDisabledException()
             if not (self.paused or (
                     self.current_task is not None and self.current_task.paused) or self.interaction is None or not self.interaction.should_capture()):
-                to_sleep = self.pause_end_time - time.time()
+                to_sleep = self.pause_end_time - time.monotonic()
                 if to_sleep <= 0:
                     return
-                time.sleep(to_sleep)
-            time.sleep(0.1)
+                self.exit_event.wait(min(to_sleep, 0.05))
+            else:
+                self.exit_event.wait(0.1)
 
     def pause(self, task=None):
         if task is not None:
@@ -188,13 +213,13 @@ class TaskExecutor:
             self.paused = True
             communicate.executor_paused.emit(self.paused)
         self.reset_scene()
-        self.pause_start = time.time()
+        self.pause_start = time.monotonic()
 
     def start(self):
         if self.paused:
             self.paused = False
             communicate.executor_paused.emit(self.paused)
-            self.pause_end_time += self.pause_start - time.time()
+            self.pause_end_time += self.pause_start - time.monotonic()
 
     def wait_scene(self, scene_type, time_out, pre_action, post_action):
         return self.wait_condition(lambda: self.detect_scene(scene_type), time_out, pre_action, post_action)
@@ -239,21 +264,37 @@ class TaskExecutor:
             logger.error(f"next_task exit_event.is_set exit")
             return None, False
         cycled = False
-        for onetime_task in self.onetime_tasks:
-            if onetime_task.enabled:
-                return onetime_task, True
-        if len(self.trigger_tasks) > 0:
-            if self.trigger_task_index >= len(self.trigger_tasks) - 1:
+        # the list is replaced, never mutated, when a task is enabled or disabled
+        active_onetime_tasks = self._active_onetime_tasks
+        if active_onetime_tasks:
+            return active_onetime_tasks[0], True
+        # rotate over the enabled trigger tasks only, a disabled one must not cost an idle wait per cycle
+        active_trigger_tasks = self._active_trigger_tasks
+        if len(active_trigger_tasks) > 0:
+            if self.trigger_task_index >= len(active_trigger_tasks) - 1:
                 self.trigger_task_index = -1
                 cycled = True
             self.trigger_task_index += 1
-            task = self.trigger_tasks[self.trigger_task_index]
+            task = active_trigger_tasks[self.trigger_task_index]
             if task.enabled and task.should_check_trigger():
                 return task, cycled
         return None, cycled
 
     def active_trigger_task_count(self):
-        return len([x for x in self.trigger_tasks if x.enabled])
+        return len(self._active_trigger_tasks)
+
+    def _on_task_state_change(self, task):
+        self._update_active_tasks()
+        self.clear_scene_cache()
+
+    def _update_active_tasks(self):
+        """
+        Rebuilds the enabled task lists, called when a task is enabled or disabled,
+        so next_task doesn't need to check every task on every frame.
+        """
+        with self._tasks_lock:
+            self._active_onetime_tasks = [task for task in self.onetime_tasks if task.enabled]
+            self._active_trigger_tasks = [task for task in self.trigger_tasks if task.enabled]
 
     def execute(self):
         logger.info(f"start execute")
@@ -263,9 +304,10 @@ class TaskExecutor:
                 self.sleep(1)
             task, cycled = self.next_task()
             if not task:
-                time.sleep(1)
+                self.exit_event.wait(1)
                 continue
             if cycled:
+                self.limit_fps()
                 self.next_frame()
                 self.detect_scene()
             elif time.time() - self._last_frame_time > 1:
@@ -312,8 +354,35 @@ class TaskExecutor:
         for task in self.trigger_tasks:
             task.on_destroy()
 
+    def limit_fps(self):
+        """
+        Waits until target_frame_interval has passed since the previous trigger task cycle started.
+        """
+        now = time.monotonic()
+        to_wait = self.target_frame_interval - (now - self._last_cycle_time)
+        if to_wait > 0:
+            self.exit_event.wait(to_wait)
+            now = time.monotonic()
+        self._last_cycle_time = now
+
     def add_frame_stats(self):
         self.frame_stats.add_frame()
+        # the ui only needs a few updates per second, don't emit the signals on every frame,
+        # a frame inside the interval schedules one trailing emit so the ui isn't left with stale stats
+        elapsed = time.monotonic() - self._last_stats_emit
+        if elapsed >= 0.1:
+            self.emit_frame_stats()
+        elif self._trailing_stats_emit is None:
+            self._trailing_stats_emit = threading.Timer(0.1 - elapsed, self.emit_trailing_frame_stats)
+            self._trailing_stats_emit.daemon = True
+            self._trailing_stats_emit.start()
+
+    def emit_trailing_frame_stats(self):
+        self._trailing_stats_emit = None
+        self.emit_frame_stats()
+
+    def emit_frame_stats(self):
+        self._last_stats_emit = time.monotonic()
         mean = self.frame_stats.mean()
         if mean > 0:
             communicate.frame_time.emit(mean)
@@ -326,7 +395,30 @@ class TaskExecutor:
     def latest_scene(self):
         return self.current_scene or self.last_scene
 
+    def clear_scene_cache(self):
+        # called from the gui thread, bump the generation so a detect_scene running right now doesn't store its result
+        self._scene_cache_generation += 1
+        self._scene_cache = None
+
     def detect_scene(self, scene_type=None):
+        """
+        Detects the scene of the current frame. The result is cached by a checksum of the whole frame,
+        so an unchanged screen doesn't run every scene.detect again.
+        """
+        if self._frame is None:
+            return self.do_detect_scene(scene_type)
+        cache_key = (frame_fingerprint(self._frame), scene_type)
+        generation = self._scene_cache_generation
+        cache = self._scene_cache
+        if cache is not None and cache[0] == generation and cache[1] == cache_key:
+            self.current_scene = cache[2]
+            return self.current_scene
+        result = self.do_detect_scene(scene_type)
+        if generation == self._scene_cache_generation:
+            self._scene_cache = (generation, cache_key, result)
+        return result
+
+    def do_detect_scene(self, scene_type=None):
         latest_scene = self.latest_scene()
         if latest_scene is not None:
             # detect the last scene optimistically
@@ -365,6 +457,15 @@ class TaskExecutor:
                 return trigger_task
 
 
+def frame_fingerprint(frame):
+    """
+    A checksum of every byte of the frame together with its shape, crc32 reads the buffer without copying it.
+    """
+    if not frame.flags.c_contiguous:
+        frame = frame.copy()
+    return frame.shape, zlib.crc32(frame)
+
+
 def list_or_obj_to_str(val):
     if val is not None:
         if isinstance(val, list):
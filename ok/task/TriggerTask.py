@@ -5,6 +5,7 @@ logger = get_logger(__name__)
 
 
 class TriggerTask(BaseTask):
+    __slots__ = ()
 
     def __init__(self):
         super().__init__()
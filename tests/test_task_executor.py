@@ -0,0 +1,49 @@
+import unittest
+
+import numpy as np
+
+from ok.task.TaskExecutor import TaskExecutor, frame_fingerprint
+
+
+class TestSceneCache(unittest.TestCase):
+
+    def create_executor(self, frame):
+        # skip __init__, detect_scene only needs the frame and the scene cache
+        executor = TaskExecutor.__new__(TaskExecutor)
+        executor._frame = frame
+        executor._scene_cache = None
+        executor._scene_cache_generation = 0
+        executor.detect_count = 0
+
+        def do_detect_scene(scene_type=None):
+            executor.detect_count += 1
+            return executor.detect_count
+
+        executor.do_detect_scene = do_detect_scene
+        return executor
+
+    def test_unchanged_frame_hits_cache(self):
+        frame = np.zeros((64, 64, 3), dtype=np.uint8)
+        executor = self.create_executor(frame)
+        self.assertEqual(executor.detect_scene(), 1)
+        self.assertEqual(executor.detect_scene(), 1)
+        self.assertEqual(executor.detect_count, 1)
+
+    def test_change_off_sampling_grid_misses_cache(self):
+        frame = np.zeros((64, 64, 3), dtype=np.uint8)
+        executor = self.create_executor(frame)
+        executor.detect_scene()
+        changed = frame.copy()
+        changed[17, 33, 1] = 1
+        self.assertNotEqual(frame_fingerprint(frame), frame_fingerprint(changed))
+        executor._frame = changed
+        self.assertEqual(executor.detect_scene(), 2)
+
+    def test_non_contiguous_frame(self):
+        frame = np.arange(64 * 64 * 4, dtype=np.uint32).astype(np.uint8).reshape(64, 64, 4)
+        view = frame[:, :, :3]
+        self.assertEqual(frame_fingerprint(view), frame_fingerprint(view.copy()))
+
+
+if __name__ == '__main__':
+    unittest.main()